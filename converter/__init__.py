@@ -0,0 +1,26 @@
+"""GUI conversion engine: RBXMX/RBXM models to Lua scripts or RBXM models
+
+Deliberately free of discord.py and aiohttp, and with no import-time state, so
+workers, tests and tools can use it cheaply. Options are plain dicts:
+
+    draggable   bool, add drag handling to the main frame
+    position    'center', 'topleft', ... (see UniversalConverter.convert_items)
+    scale       offset multiplier, e.g. 1.5
+    destroykey  'none', 'x', 'escape', 'f1', ...
+    gui_name    ScreenGui name
+    lazy        one of UniversalConverter.LAZY_MODES
+    preload     one of UniversalConverter.PRELOAD_MODES
+    format      'lua' (default) or 'rbxm'
+"""
+from .parsers import Item, BinaryModelError, RBXMLParser, RBXMBinaryParser
+from .generators import LuaCodeGenerator, RBXMModelWriter
+from .core import UniversalConverter, create_pool
+from .api import ConversionResult, parse, convert_parsed, convert
+
+# python -m converter --import-time fails when importing the package takes longer
+IMPORT_BUDGET_MS = 40
+
+__all__ = [
+    'Item', 'BinaryModelError', 'RBXMLParser', 'RBXMBinaryParser', 'LuaCodeGenerator', 'RBXMModelWriter',
+    'UniversalConverter', 'create_pool', 'ConversionResult', 'parse', 'convert_parsed', 'convert', 'IMPORT_BUDGET_MS',
+]
@@ -0,0 +1,91 @@
+"""Command-line caller: python -m converter in.rbxmx [-o out.lua] [options]
+
+python -m converter --import-time checks the package against IMPORT_BUDGET_MS.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+import converter
+
+# Modules the engine must never pull in at import time
+HEAVY_MODULES = ['discord', 'aiohttp', 'multiprocessing', 'lz4']
+
+MEASURE = (
+    'import sys, time\n'
+    't = time.perf_counter()\n'
+    'import converter\n'
+    'print((time.perf_counter() - t) * 1000)\n'
+    'print(",".join(m for m in {heavy!r} if m in sys.modules))\n'
+)
+
+
+def measure_import(runs=5):
+    """Best-of-N import time in fresh interpreters, plus any heavy modules it loaded"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(converter.__file__)))
+    code = MEASURE.format(heavy=HEAVY_MODULES)
+    best, heavy = float('inf'), ''
+    # The first run compiles bytecode, so it only warms up
+    for _ in range(runs + 1):
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True,
+                             text=True, check=True).stdout.split('\n')
+        best = min(best, float(out[0]))
+        heavy = out[1]
+    return best, heavy
+
+
+def check_import_time():
+    ms, heavy = measure_import()
+    print(f"import converter: {ms:.1f}ms (budget {converter.IMPORT_BUDGET_MS}ms)")
+    if heavy:
+        print(f"loaded at import: {heavy}")
+    return 0 if ms <= converter.IMPORT_BUDGET_MS and not heavy else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', nargs='?', help='.rbxmx or .rbxm file')
+    parser.add_argument('-o', '--output', help='output path (default: input name with .lua or .rbxm)')
+    parser.add_argument('--import-time', action='store_true', help='check the import-time budget and exit')
+    parser.add_argument('--drag', action='store_true')
+    parser.add_argument('--position', default='center')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--key', default='none')
+    parser.add_argument('--name', default='ConvertedGui')
+    parser.add_argument('--lazy', default='none', choices=converter.UniversalConverter.LAZY_MODES)
+    parser.add_argument('--preload', default='none', choices=converter.UniversalConverter.PRELOAD_MODES)
+    parser.add_argument('--format', default='lua', choices=['lua', 'rbxm'])
+    parser.add_argument('--workers', type=int, default=1, help='worker processes for very large files')
+    args = parser.parse_args()
+
+    if args.import_time:
+        return check_import_time()
+    if not args.input:
+        parser.error('an input file is required')
+
+    with open(args.input, 'rb') as f:
+        data = f.read()
+    options = {
+        'draggable': args.drag, 'position': args.position, 'scale': args.scale,
+        'destroykey': args.key, 'gui_name': args.name, 'lazy': args.lazy,
+        'preload': args.preload, 'format': args.format,
+    }
+    pool = converter.create_pool(args.workers)
+    try:
+        result = converter.convert(data, options, pool)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    base = os.path.splitext(args.input)[0]
+    output = args.output or (base + '_converted.rbxm' if args.format == 'rbxm' else base + '.lua')
+    with open(output, 'wb') as f:
+        f.write(result.output if args.format == 'rbxm' else result.output.encode('utf-8'))
+    print(f"{output}: {result.instances} instances, {len(result.assets)} assets "
+          f"({result.duplicates} duplicate references)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Pure conversion API: bytes and options in, a ConversionResult out"""
+from collections import namedtuple
+
+from .parsers import RBXMLParser, RBXMBinaryParser
+from .core import UniversalConverter
+
+# output is Lua source (str) or, for format='rbxm', model bytes; assets lists the
+# preload manifest in emission order and duplicates counts repeated references
+ConversionResult = namedtuple('ConversionResult', 'output instances deferred assets duplicates')
+
+
+def parse(data):
+    """Parse .rbxm or .rbxmx bytes into top-level Items
+
+    Raises ET.ParseError for bad XML, UnicodeDecodeError for undecodable text
+    and BinaryModelError for unreadable binary models.
+    """
+    magic = RBXMBinaryParser.MAGIC
+    if bytes(data[:len(magic)]) == magic:
+        return RBXMBinaryParser.parse(data)
+    return RBXMLParser.parse(bytes(data).decode('utf-8'))
+
+
+def convert_parsed(items, options=None, pool=None):
+    """Convert parsed Items; options are the converter config keys, all optional
+
+    pool is an optional create_pool() result shared across conversions.
+    """
+    conv = UniversalConverter(pool)
+    conv.set_config(**(options or {}))
+    if conv.config.get('format') == 'rbxm':
+        output = conv.convert_model(items)
+    else:
+        output = conv.convert_items(items)
+    return ConversionResult(output, conv.instances, conv.deferred, tuple(conv.assets),
+                            conv.asset_refs - len(conv.assets))
+
+
+def convert(data, options=None, pool=None):
+    """Convert .rbxm or .rbxmx bytes in one call"""
+    return convert_parsed(parse(data), options, pool)
@@ -0,0 +1,883 @@
+"""UniversalConverter: walks parsed Items and writes them through a generator"""
+import xml.etree.ElementTree as ET
+
+from .parsers import RBXMLParser
+from .generators import LuaCodeGenerator, RBXMModelWriter
+
+
+class UniversalConverter:
+    """Main converter class that produces clean Lua output"""
+    
+    # Token to Enum mappings
+    ENUMS = {
+        'TextXAlignment': {0: 'Center', 1: 'Left', 2: 'Right'},
+        'TextYAlignment': {0: 'Center', 1: 'Top', 2: 'Bottom'},
+        'SortOrder': {0: 'Name', 1: 'Custom', 2: 'LayoutOrder'},
+        'FillDirection': {0: 'Horizontal', 1: 'Vertical'},
+        'HorizontalAlignment': {0: 'Center', 1: 'Left', 2: 'Right'},
+        'VerticalAlignment': {0: 'Center', 1: 'Top', 2: 'Bottom'},
+        'AutomaticSize': {0: 'None', 1: 'X', 2: 'Y', 3: 'XY'},
+        'ScaleType': {0: 'Stretch', 1: 'Slice', 2: 'Tile', 3: 'Fit', 4: 'Crop'},
+        'ApplyStrokeMode': {0: 'Contextual', 1: 'Border'},
+        'LineJoinMode': {0: 'Round', 1: 'Bevel', 2: 'Miter'},
+        'StartCorner': {0: 'TopLeft', 1: 'TopRight', 2: 'BottomLeft', 3: 'BottomRight'},
+    }
+    
+    UI_COMPONENTS = {'UIStroke', 'UICorner', 'UIGradient', 'UIListLayout', 'UIGridLayout', 
+                     'UIPadding', 'UIAspectRatioConstraint', 'UISizeConstraint', 'UIScale'}
+    
+    # Deferred instantiation: 'hidden' wraps children of hidden frames in builders,
+    # 'all' additionally defers ScrollingFrame contents until after the first frame
+    LAZY_MODES = ['none', 'hidden', 'all']
+    LAZY_HELPERS = ['lazyPending', 'lazyBuild', 'lazyWhenVisible', 'lazyDeferred', 'lazyApi']
+    
+    # Asset preloading: 'blocking' waits for every asset before the GUI is parented,
+    # 'background' starts loading without waiting, assets of visible elements first
+    PRELOAD_MODES = ['none', 'blocking', 'background']
+    
+    # Classes whose writers assign a ZIndex
+    ZINDEXED = {'Frame', 'TextLabel', 'TextButton', 'TextBox', 'ImageLabel', 'ImageButton', 'ScrollingFrame'}
+    
+    # Parallel generation: files below PARALLEL_MIN_SIZE items stay sequential, and
+    # subtrees are grouped into worker units of roughly UNIT_SIZE items. Planning and
+    # packing units still run in the caller (about 30% + 33% of a sequential write at
+    # 30k items), which caps the speedup near 1.6x, so only big files are worth the trip
+    PARALLEL_MIN_SIZE = 20000
+    UNIT_SIZE = 1000
+    
+    def __init__(self, pool=None):
+        self.config = {}
+        self.parser = RBXMLParser()
+        self.gen = None
+        self.zindex = 0
+        self.deferred = 0
+        self.instances = 0
+        # Long-lived worker pool from create_pool(); only used for files of PARALLEL_MIN_SIZE or more
+        self.pool = pool
+        self.parallel = False
+        self.assets = {}
+        self.asset_refs = 0
+        self.hidden = 0
+    
+    def set_config(self, **kwargs):
+        self.config = kwargs
+    
+    def enum_val(self, enum_type, token):
+        return self.ENUMS.get(enum_type, {}).get(token, str(token))
+    
+    def write_frame(self, var, props, parent, is_top_level=False):
+        """Write a Frame element"""
+        g = self.gen
+        p = self.parser
+        
+        name = p.get_string(props, 'Name')
+        if name:
+            g.w(f'{var}.Name = "{g.escape_string(name)}"')
+        
+        size = p.get_udim2(props, 'Size')
+        if size:
+            g.w(f'{var}.Size = {g.fmt_udim2(size)}')
+        
+        pos = p.get_udim2(props, 'Position')
+        if pos:
+            g.w(f'{var}.Position = {g.fmt_udim2(pos)}')
+        
+        anchor = p.get_vector2(props, 'AnchorPoint')
+        if anchor and (anchor[0] != 0 or anchor[1] != 0):
+            g.w(f'{var}.AnchorPoint = Vector2.new({anchor[0]}, {anchor[1]})')
+        
+        bg_color = p.get_color3(props, 'BackgroundColor3')
+        if bg_color:
+            g.w(f'{var}.BackgroundColor3 = {g.fmt_color3(bg_color)}')
+        
+        bg_trans = p.get_float(props, 'BackgroundTransparency')
+        if bg_trans is not None:
+            g.w(f'{var}.BackgroundTransparency = {bg_trans}')
+        
+        border = p.get_int(props, 'BorderSizePixel')
+        if border is not None:
+            g.w(f'{var}.BorderSizePixel = {border}')
+        
+        clip = p.get_bool(props, 'ClipsDescendants')
+        if clip:
+            g.w(f'{var}.ClipsDescendants = true')
+        
+        visible = p.get_bool(props, 'Visible')
+        if visible is False:
+            g.w(f'{var}.Visible = false')
+        
+        layout_order = p.get_int(props, 'LayoutOrder')
+        if layout_order is not None and layout_order != 0:
+            g.w(f'{var}.LayoutOrder = {layout_order}')
+        
+        self.zindex += 1
+        g.w(f'{var}.ZIndex = {self.zindex}')
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_text_element(self, var, props, parent, cls):
+        """Write TextLabel, TextButton, or TextBox"""
+        g = self.gen
+        p = self.parser
+        
+        name = p.get_string(props, 'Name')
+        if name:
+            g.w(f'{var}.Name = "{g.escape_string(name)}"')
+        
+        size = p.get_udim2(props, 'Size')
+        if size:
+            g.w(f'{var}.Size = {g.fmt_udim2(size)}')
+        
+        pos = p.get_udim2(props, 'Position')
+        if pos:
+            g.w(f'{var}.Position = {g.fmt_udim2(pos)}')
+        
+        anchor = p.get_vector2(props, 'AnchorPoint')
+        if anchor and (anchor[0] != 0 or anchor[1] != 0):
+            g.w(f'{var}.AnchorPoint = Vector2.new({anchor[0]}, {anchor[1]})')
+        
+        bg_trans = p.get_float(props, 'BackgroundTransparency')
+        if bg_trans is not None:
+            g.w(f'{var}.BackgroundTransparency = {bg_trans}')
+        
+        bg_color = p.get_color3(props, 'BackgroundColor3')
+        if bg_color and bg_trans != 1:
+            g.w(f'{var}.BackgroundColor3 = {g.fmt_color3(bg_color)}')
+        
+        border = p.get_int(props, 'BorderSizePixel')
+        if border is not None:
+            g.w(f'{var}.BorderSizePixel = {border}')
+        
+        text = p.get_string(props, 'Text')
+        if text is not None:
+            g.w(f'{var}.Text = "{g.escape_string(text)}"')
+        
+        text_color = p.get_color3(props, 'TextColor3')
+        if text_color:
+            g.w(f'{var}.TextColor3 = {g.fmt_color3(text_color)}')
+        
+        text_size = p.get_int(props, 'TextSize')
+        if text_size:
+            g.w(f'{var}.TextSize = {g.scale_int(text_size)}')
+        
+        font = p.get_font(props, 'FontFace')
+        if font:
+            weight = g.WEIGHT_MAP.get(font['weight'], 'Regular')
+            g.w(f'{var}.FontFace = Font.new("{font["url"]}", Enum.FontWeight.{weight}, Enum.FontStyle.{font["style"]})')
+        
+        text_x = p.get_token(props, 'TextXAlignment')
+        if text_x is not None:
+            g.w(f'{var}.TextXAlignment = Enum.TextXAlignment.{self.enum_val("TextXAlignment", text_x)}')
+        
+        text_y = p.get_token(props, 'TextYAlignment')
+        if text_y is not None:
+            g.w(f'{var}.TextYAlignment = Enum.TextYAlignment.{self.enum_val("TextYAlignment", text_y)}')
+        
+        text_wrapped = p.get_bool(props, 'TextWrapped')
+        if text_wrapped:
+            g.w(f'{var}.TextWrapped = true')
+        
+        text_scaled = p.get_bool(props, 'TextScaled')
+        if text_scaled:
+            g.w(f'{var}.TextScaled = true')
+        
+        text_trans = p.get_float(props, 'TextTransparency')
+        if text_trans is not None and text_trans != 0:
+            g.w(f'{var}.TextTransparency = {text_trans}')
+        
+        rich = p.get_bool(props, 'RichText')
+        if rich:
+            g.w(f'{var}.RichText = true')
+        
+        # TextBox specific
+        if cls == 'TextBox':
+            placeholder = p.get_string(props, 'PlaceholderText')
+            if placeholder:
+                g.w(f'{var}.PlaceholderText = "{g.escape_string(placeholder)}"')
+            clear = p.get_bool(props, 'ClearTextOnFocus')
+            if clear is False:
+                g.w(f'{var}.ClearTextOnFocus = false')
+        
+        # Button specific
+        if cls in ['TextButton', 'ImageButton']:
+            auto_color = p.get_bool(props, 'AutoButtonColor')
+            if auto_color is False:
+                g.w(f'{var}.AutoButtonColor = false')
+        
+        self.zindex += 1
+        g.w(f'{var}.ZIndex = {self.zindex}')
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_image_element(self, var, props, parent, cls):
+        """Write ImageLabel or ImageButton"""
+        g = self.gen
+        p = self.parser
+        
+        name = p.get_string(props, 'Name')
+        if name:
+            g.w(f'{var}.Name = "{g.escape_string(name)}"')
+        
+        size = p.get_udim2(props, 'Size')
+        if size:
+            g.w(f'{var}.Size = {g.fmt_udim2(size)}')
+        
+        pos = p.get_udim2(props, 'Position')
+        if pos:
+            g.w(f'{var}.Position = {g.fmt_udim2(pos)}')
+        
+        anchor = p.get_vector2(props, 'AnchorPoint')
+        if anchor and (anchor[0] != 0 or anchor[1] != 0):
+            g.w(f'{var}.AnchorPoint = Vector2.new({anchor[0]}, {anchor[1]})')
+        
+        bg_color = p.get_color3(props, 'BackgroundColor3')
+        if bg_color:
+            g.w(f'{var}.BackgroundColor3 = {g.fmt_color3(bg_color)}')
+        
+        bg_trans = p.get_float(props, 'BackgroundTransparency')
+        if bg_trans is not None:
+            g.w(f'{var}.BackgroundTransparency = {bg_trans}')
+        
+        border = p.get_int(props, 'BorderSizePixel')
+        if border is not None:
+            g.w(f'{var}.BorderSizePixel = {border}')
+        
+        image = p.get_content(props, 'Image')
+        if image:
+            g.w(f'{var}.Image = "{image}"')
+        
+        image_color = p.get_color3(props, 'ImageColor3')
+        if image_color:
+            g.w(f'{var}.ImageColor3 = {g.fmt_color3(image_color)}')
+        
+        image_trans = p.get_float(props, 'ImageTransparency')
+        if image_trans is not None and image_trans != 0:
+            g.w(f'{var}.ImageTransparency = {image_trans}')
+        
+        scale_type = p.get_token(props, 'ScaleType')
+        if scale_type is not None and scale_type != 0:
+            g.w(f'{var}.ScaleType = Enum.ScaleType.{self.enum_val("ScaleType", scale_type)}')
+        
+        if cls == 'ImageButton':
+            auto_color = p.get_bool(props, 'AutoButtonColor')
+            if auto_color is False:
+                g.w(f'{var}.AutoButtonColor = false')
+        
+        self.zindex += 1
+        g.w(f'{var}.ZIndex = {self.zindex}')
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_scrolling_frame(self, var, props, parent):
+        """Write ScrollingFrame"""
+        g = self.gen
+        p = self.parser
+        
+        name = p.get_string(props, 'Name')
+        if name:
+            g.w(f'{var}.Name = "{g.escape_string(name)}"')
+        
+        size = p.get_udim2(props, 'Size')
+        if size:
+            g.w(f'{var}.Size = {g.fmt_udim2(size)}')
+        
+        pos = p.get_udim2(props, 'Position')
+        if pos:
+            g.w(f'{var}.Position = {g.fmt_udim2(pos)}')
+        
+        bg_trans = p.get_float(props, 'BackgroundTransparency')
+        if bg_trans is not None:
+            g.w(f'{var}.BackgroundTransparency = {bg_trans}')
+        
+        border = p.get_int(props, 'BorderSizePixel')
+        if border is not None:
+            g.w(f'{var}.BorderSizePixel = {border}')
+        
+        canvas = p.get_udim2(props, 'CanvasSize')
+        if canvas:
+            g.w(f'{var}.CanvasSize = {g.fmt_udim2(canvas)}')
+        
+        scroll_thick = p.get_int(props, 'ScrollBarThickness')
+        if scroll_thick is not None:
+            g.w(f'{var}.ScrollBarThickness = {g.scale_int(scroll_thick)}')
+        
+        self.zindex += 1
+        g.w(f'{var}.ZIndex = {self.zindex}')
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_ui_stroke(self, var, props, parent):
+        """Write UIStroke component"""
+        g = self.gen
+        p = self.parser
+        
+        color = p.get_color3(props, 'Color')
+        if color:
+            g.w(f'{var}.Color = {g.fmt_color3(color)}')
+        
+        thickness = p.get_float(props, 'Thickness')
+        if thickness is not None:
+            g.w(f'{var}.Thickness = {thickness * self.gen.scale}')
+        
+        trans = p.get_float(props, 'Transparency')
+        if trans is not None and trans != 0:
+            g.w(f'{var}.Transparency = {trans}')
+        
+        apply_mode = p.get_token(props, 'ApplyStrokeMode')
+        if apply_mode is not None and apply_mode != 0:
+            g.w(f'{var}.ApplyStrokeMode = Enum.ApplyStrokeMode.{self.enum_val("ApplyStrokeMode", apply_mode)}')
+        
+        line_join = p.get_token(props, 'LineJoinMode')
+        if line_join is not None and line_join != 0:
+            g.w(f'{var}.LineJoinMode = Enum.LineJoinMode.{self.enum_val("LineJoinMode", line_join)}')
+        
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_ui_corner(self, var, props, parent):
+        """Write UICorner component"""
+        g = self.gen
+        p = self.parser
+        
+        radius = p.get_udim(props, 'CornerRadius')
+        if radius:
+            g.w(f'{var}.CornerRadius = {g.fmt_udim(radius)}')
+        
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_ui_list_layout(self, var, props, parent):
+        """Write UIListLayout component"""
+        g = self.gen
+        p = self.parser
+        
+        fill_dir = p.get_token(props, 'FillDirection')
+        if fill_dir is not None and fill_dir != 0:
+            g.w(f'{var}.FillDirection = Enum.FillDirection.{self.enum_val("FillDirection", fill_dir)}')
+        
+        h_align = p.get_token(props, 'HorizontalAlignment')
+        if h_align is not None and h_align != 0:
+            g.w(f'{var}.HorizontalAlignment = Enum.HorizontalAlignment.{self.enum_val("HorizontalAlignment", h_align)}')
+        
+        v_align = p.get_token(props, 'VerticalAlignment')
+        if v_align is not None and v_align != 0:
+            g.w(f'{var}.VerticalAlignment = Enum.VerticalAlignment.{self.enum_val("VerticalAlignment", v_align)}')
+        
+        sort = p.get_token(props, 'SortOrder')
+        if sort is not None:
+            g.w(f'{var}.SortOrder = Enum.SortOrder.{self.enum_val("SortOrder", sort)}')
+        
+        padding = p.get_udim(props, 'Padding')
+        if padding:
+            g.w(f'{var}.Padding = {g.fmt_udim(padding)}')
+        
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_ui_grid_layout(self, var, props, parent):
+        """Write UIGridLayout component"""
+        g = self.gen
+        p = self.parser
+        
+        cell_size = p.get_udim2(props, 'CellSize')
+        if cell_size:
+            g.w(f'{var}.CellSize = {g.fmt_udim2(cell_size)}')
+        
+        cell_padding = p.get_udim2(props, 'CellPadding')
+        if cell_padding:
+            g.w(f'{var}.CellPadding = {g.fmt_udim2(cell_padding)}')
+        
+        sort = p.get_token(props, 'SortOrder')
+        if sort is not None:
+            g.w(f'{var}.SortOrder = Enum.SortOrder.{self.enum_val("SortOrder", sort)}')
+        
+        fill_dir = p.get_token(props, 'FillDirection')
+        if fill_dir is not None and fill_dir != 0:
+            g.w(f'{var}.FillDirection = Enum.FillDirection.{self.enum_val("FillDirection", fill_dir)}')
+        
+        start_corner = p.get_token(props, 'StartCorner')
+        if start_corner is not None and start_corner != 0:
+            g.w(f'{var}.StartCorner = Enum.StartCorner.{self.enum_val("StartCorner", start_corner)}')
+        
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_ui_padding(self, var, props, parent):
+        """Write UIPadding component"""
+        g = self.gen
+        p = self.parser
+        
+        for side in ['Left', 'Right', 'Top', 'Bottom']:
+            pad = p.get_udim(props, f'Padding{side}')
+            if pad:
+                g.w(f'{var}.Padding{side} = {g.fmt_udim(pad)}')
+        
+        g.w(f'{var}.Parent = {parent}')
+    
+    def write_element(self, item, parent_var):
+        """Write any element and its children recursively"""
+        cls = item.cls
+        if not cls:
+            return
+        self.instances += 1
+        
+        props = item.props
+        name = self.parser.get_string(props, 'Name') if props else None
+        var = self.gen.make_var_name(name, cls)
+        
+        self.gen.w(f"local {var} = Instance.new('{cls}')")
+        if props:
+            self.note_assets(cls, props)
+        
+        # Write element based on class
+        if cls == 'Frame':
+            self.write_frame(var, props, parent_var)
+        elif cls in ['TextLabel', 'TextButton', 'TextBox']:
+            self.write_text_element(var, props, parent_var, cls)
+        elif cls in ['ImageLabel', 'ImageButton']:
+            self.write_image_element(var, props, parent_var, cls)
+        elif cls == 'ScrollingFrame':
+            self.write_scrolling_frame(var, props, parent_var)
+        elif cls == 'UIStroke':
+            self.write_ui_stroke(var, props, parent_var)
+        elif cls == 'UICorner':
+            self.write_ui_corner(var, props, parent_var)
+        elif cls == 'UIListLayout':
+            self.write_ui_list_layout(var, props, parent_var)
+        elif cls == 'UIGridLayout':
+            self.write_ui_grid_layout(var, props, parent_var)
+        elif cls == 'UIPadding':
+            self.write_ui_padding(var, props, parent_var)
+        else:
+            # Generic fallback
+            if props:
+                n = self.parser.get_string(props, 'Name')
+                if n:
+                    self.gen.w(f'{var}.Name = "{self.gen.escape_string(n)}"')
+            self.gen.w(f'{var}.Parent = {parent_var}')
+        
+        self.gen.w('')
+        
+        # Process children, wrapped in a builder function when deferred
+        eager, children, trigger = self.split_deferred(cls, props, item.children)
+        self.write_children(eager, var)
+        if trigger:
+            builder = self.gen.make_var_name(f'Build{var[0].upper()}{var[1:]}', cls)
+            self.gen.w(f'local function {builder}()')
+            self.gen.indent += 1
+        
+        hidden = cls == 'Frame' and self.parser.get_bool(props, 'Visible') is False
+        self.hidden += hidden
+        self.write_children(children, var)
+        self.hidden -= hidden
+        
+        if trigger:
+            if self.gen.lines[-1] == '':
+                self.gen.lines.pop()
+            self.gen.indent -= 1
+            self.gen.w('end')
+            self.gen.w(f'{trigger}({var}, {builder})')
+            self.gen.w('')
+            self.deferred += 1
+    
+    def split_deferred(self, cls, props, children):
+        """Return (eager children, remaining children, trigger helper or None)"""
+        trigger = self.defer_trigger(cls, props) if children else None
+        if trigger != 'lazyDeferred':
+            return [], children, trigger
+        # A visible ScrollingFrame keeps its own decorations; only content waits
+        eager = [c for c in children if c.cls in self.UI_COMPONENTS]
+        children = [c for c in children if c.cls not in self.UI_COMPONENTS]
+        return eager, children, trigger if children else None
+    
+    def plan_element(self, item):
+        """Advance names, ZIndex, deferral and assets exactly as write_element would, without writing"""
+        cls = item.cls
+        if not cls:
+            return
+        self.instances += 1
+        props = item.props
+        name = self.parser.get_string(props, 'Name') if props else None
+        var = self.gen.make_var_name(name, cls)
+        if props:
+            self.note_assets(cls, props)
+        if cls in self.ZINDEXED:
+            self.zindex += 1
+        
+        eager, children, trigger = self.split_deferred(cls, props, item.children)
+        for child in eager:
+            self.plan_element(child)
+        if trigger:
+            self.gen.make_var_name(f'Build{var[0].upper()}{var[1:]}', cls)
+        hidden = cls == 'Frame' and self.parser.get_bool(props, 'Visible') is False
+        self.hidden += hidden
+        for child in children:
+            self.plan_element(child)
+        self.hidden -= hidden
+        if trigger:
+            self.deferred += 1
+    
+    def note_assets(self, cls, props):
+        """Add the image or font this element's writer assigns to the asset manifest"""
+        if cls in ('ImageLabel', 'ImageButton'):
+            url = self.parser.get_content(props, 'Image')
+        elif cls in ('TextLabel', 'TextButton', 'TextBox'):
+            font = self.parser.get_font(props, 'FontFace')
+            url = font['url'] if font else None
+        else:
+            return
+        if not url:
+            return
+        self.asset_refs += 1
+        # An asset stays hidden only while every element using it sits under a hidden frame
+        self.assets[url] = self.assets.get(url, True) and self.hidden > 0
+    
+    def preload_lines(self, mode):
+        """Return the PreloadAsync block for the collected assets"""
+        if not self.assets:
+            return []
+        g = self.gen
+        # Visible-first; sorted() is stable, so each group keeps emission order
+        assets = sorted(self.assets, key=self.assets.get)
+        entries = [f'\t"{g.escape_string(url)}",' for url in assets]
+        if mode == 'blocking':
+            return [
+                f"-- Preload {len(assets)} assets before the GUI is shown",
+                "game:GetService('ContentProvider'):PreloadAsync({",
+                *entries,
+                "})",
+            ]
+        return [
+            f"-- Preload {len(assets)} assets in the background, visible ones first",
+            "task.spawn(function()",
+            "\tgame:GetService('ContentProvider'):PreloadAsync({",
+            *['\t' + e for e in entries],
+            "\t})",
+            "end)",
+        ]
+    
+    def write_children(self, children, parent_var):
+        """Write sibling subtrees, handing batches to worker processes when parallel"""
+        if not self.parallel:
+            for child in children:
+                self.write_element(child, parent_var)
+            return
+        
+        batch, size = [], 0
+        for child in children:
+            n = child.size
+            if n > self.UNIT_SIZE:
+                # Too big for one unit: write this element here and split its children
+                self.dispatch_unit(batch, parent_var)
+                batch, size = [], 0
+                self.write_element(child, parent_var)
+                continue
+            batch.append(child)
+            size += n
+            if size >= self.UNIT_SIZE:
+                self.dispatch_unit(batch, parent_var)
+                batch, size = [], 0
+        self.dispatch_unit(batch, parent_var)
+    
+    def write_parallel(self, items):
+        """Write top-level items with subtree batches generated in worker processes"""
+        g = self.gen
+        self.parallel = True
+        try:
+            self.write_children(items, 'main')
+        finally:
+            self.parallel = False
+        # Stitch worker output back in submission order
+        lines = []
+        for line in g.lines:
+            if isinstance(line, str):
+                lines.append(line)
+            else:
+                lines.extend(line.get())
+        g.lines = lines
+    
+    def dispatch_unit(self, batch, parent_var):
+        """Plan a batch of subtrees in order, then submit it to a worker"""
+        if not batch:
+            return
+        g = self.gen
+        zindex = self.zindex
+        
+        # Planning only hands out names and advances counters, so the worker can
+        # start from the same state a sequential write would have reached
+        g.name_log = []
+        for item in batch:
+            self.plan_element(item)
+        names, g.name_log = g.name_log, None
+        
+        g.lines.append(self.pool.apply_async(
+            generate_unit, (RBXMLParser.pack(batch, compress=False), self.config, parent_var, g.indent, zindex, names)))
+        # write_element ends every element with a blank line; the worker drops its last
+        # one so a builder closing right after this unit can still find it here
+        if any(item.cls for item in batch):
+            g.lines.append('')
+    
+    def defer_trigger(self, cls, props):
+        """Return the helper that defers this element's children, or None"""
+        lazy = self.config.get('lazy', 'none')
+        if lazy == 'none':
+            return None
+        # Only write_frame carries Visible over, so only Frames can start hidden
+        if cls == 'Frame' and self.parser.get_bool(props, 'Visible') is False:
+            return 'lazyWhenVisible'
+        if lazy == 'all' and cls == 'ScrollingFrame':
+            return 'lazyDeferred'
+        return None
+    
+    def lazy_runtime_lines(self):
+        """Return the helper block used by deferred builders"""
+        return [
+            "-- Deferred instantiation",
+            "-- Hidden subtrees are built on first Visible change; screenGui.BuildDeferred:Invoke(inst)",
+            "-- builds one on demand, and :Invoke() with no argument builds everything still pending",
+            "local lazyPending = {}",
+            "local function lazyBuild(inst)",
+            "\tlocal builder = lazyPending[inst]",
+            "\tif builder then",
+            "\t\tlazyPending[inst] = nil",
+            "\t\tbuilder()",
+            "\tend",
+            "end",
+            "local function lazyWhenVisible(inst, builder)",
+            "\tlazyPending[inst] = builder",
+            "\tlocal conn",
+            "\tconn = inst:GetPropertyChangedSignal('Visible'):Connect(function()",
+            "\t\tif inst.Visible then",
+            "\t\t\tconn:Disconnect()",
+            "\t\t\tlazyBuild(inst)",
+            "\t\tend",
+            "\tend)",
+            "end",
+            "local function lazyDeferred(inst, builder)",
+            "\tlazyPending[inst] = builder",
+            "\t-- task.defer would still run inside this frame; Heartbeat comes after rendering",
+            "\tgame:GetService('RunService').Heartbeat:Once(function()",
+            "\t\tlazyBuild(inst)",
+            "\tend)",
+            "end",
+            "local lazyApi = Instance.new('BindableFunction')",
+            "lazyApi.Name = 'BuildDeferred'",
+            "lazyApi.OnInvoke = function(inst)",
+            "\tif inst then",
+            "\t\tlazyBuild(inst)",
+            "\telse",
+            "\t\twhile next(lazyPending) do",
+            "\t\t\tlazyBuild((next(lazyPending)))",
+            "\t\tend",
+            "\tend",
+            "\treturn true",
+            "end",
+            "lazyApi.Parent = screenGui",
+            "",
+        ]
+    
+    def convert(self, xml_str):
+        """Main conversion method"""
+        try:
+            items = self.parser.parse(xml_str)
+        except ET.ParseError as e:
+            return f'-- XML Parse Error: {e}'
+        return self.convert_items(items)
+    
+    def convert_items(self, items):
+        """Generate the script from parsed top-level Items"""
+        if not items:
+            return "-- Error: No GUI elements found in XML"
+        
+        self.gen = LuaCodeGenerator(self.config.get('scale', 1.0))
+        self.write_gui(items)
+        self.write_behaviors()
+        return self.gen.get_output()
+    
+    def convert_model(self, items):
+        """Generate a binary RBXM model from parsed top-level Items"""
+        if not items:
+            raise ValueError("No GUI elements found in the file")
+        
+        # Deferred builders only exist in scripts, so a model is always fully built
+        self.config = dict(self.config, lazy='none')
+        model = RBXMModelWriter(self.config.get('scale', 1.0))
+        self.gen = model
+        self.write_gui(items)
+        
+        # Drag and destroy-key behavior (and any preloading) ride along in a LocalScript inside the ScreenGui
+        self.gen = LuaCodeGenerator()
+        self.write_behaviors()
+        # The model is already in place when the loader runs, so it can only preload in the background
+        if self.config.get('preload', 'none') != 'none':
+            self.gen.lines += self.preload_lines('background')
+        if self.gen.lines:
+            model.add_loader(RBXMModelWriter.LOADER_HEADER + self.gen.lines)
+        self.gen = model
+        return model.get_output()
+    
+    def write_gui(self, items):
+        """Write the ScreenGui, the main container and every element"""
+        scale = self.gen.scale
+        self.zindex = 0
+        self.deferred = 0
+        self.instances = 0
+        self.assets = {}
+        self.asset_refs = 0
+        self.hidden = 0
+        g = self.gen
+        if self.config.get('lazy', 'none') != 'none':
+            g.used_names.update(self.LAZY_HELPERS)
+        
+        # Calculate bounds for main container sizing
+        min_x, min_y = float('inf'), float('inf')
+        max_x, max_y = float('-inf'), float('-inf')
+        
+        for item in items:
+            props = item.props
+            pos = self.parser.get_udim2(props, 'Position')
+            size = self.parser.get_udim2(props, 'Size')
+            if pos and size:
+                min_x = min(min_x, pos['xo'])
+                min_y = min(min_y, pos['yo'])
+                max_x = max(max_x, pos['xo'] + size['xo'])
+                max_y = max(max_y, pos['yo'] + size['yo'])
+        
+        width = int((max_x - min_x) * scale) if min_x != float('inf') else 400
+        height = int((max_y - min_y) * scale) if min_y != float('inf') else 300
+        
+        gui_name = self.config.get('gui_name', 'ConvertedGui')
+        
+        # Write header - matching the target style exactly
+        g.w("local Players = game:GetService('Players')")
+        g.w("local player = Players.LocalPlayer")
+        g.w("local playerGui = player:WaitForChild('PlayerGui')")
+        g.w("")
+        g.w("local screenGui = Instance.new('ScreenGui')")
+        g.w(f"screenGui.Name = '{gui_name}'")
+        g.w("screenGui.ResetOnSpawn = false")
+        g.w("screenGui.ZIndexBehavior = Enum.ZIndexBehavior.Sibling")
+        preload_at = len(g.lines)
+        g.w("screenGui.Parent = playerGui")
+        g.w("")
+        
+        # Create main container frame
+        g.w("local main = Instance.new('Frame')")
+        g.w("main.Name = 'Main'")
+        g.w(f"main.Size = UDim2.new(0, {width}, 0, {height})")
+        
+        # Position based on config
+        pos = self.config.get('position', 'center')
+        positions = {
+            'center': ("UDim2.new(0.5, 0, 0.5, 0)", "Vector2.new(0.5, 0.5)"),
+            'top': ("UDim2.new(0.5, 0, 0, 10)", "Vector2.new(0.5, 0)"),
+            'bottom': ("UDim2.new(0.5, 0, 1, -10)", "Vector2.new(0.5, 1)"),
+            'left': ("UDim2.new(0, 10, 0.5, 0)", "Vector2.new(0, 0.5)"),
+            'right': ("UDim2.new(1, -10, 0.5, 0)", "Vector2.new(1, 0.5)"),
+            'topleft': ("UDim2.new(0, 10, 0, 10)", "Vector2.new(0, 0)"),
+            'topright': ("UDim2.new(1, -10, 0, 10)", "Vector2.new(1, 0)"),
+            'bottomleft': ("UDim2.new(0, 10, 1, -10)", "Vector2.new(0, 1)"),
+            'bottomright': ("UDim2.new(1, -10, 1, -10)", "Vector2.new(1, 1)"),
+        }
+        
+        if pos in positions:
+            g.w(f"main.Position = {positions[pos][0]}")
+            g.w(f"main.AnchorPoint = {positions[pos][1]}")
+        else:
+            g.w("main.Position = UDim2.new(0, 0, 0, 0)")
+        
+        g.w("main.BackgroundTransparency = 1")
+        g.w("main.BorderSizePixel = 0")
+        g.w("main.Parent = screenGui")
+        g.w("")
+        
+        # Process all elements
+        lazy_at = len(g.lines)
+        if self.pool is not None and sum(item.size for item in items) >= self.PARALLEL_MIN_SIZE:
+            self.write_parallel(items)
+        else:
+            self.write_children(items, 'main')
+        
+        # Helpers only need to exist once something was actually deferred
+        if self.deferred:
+            g.lines[lazy_at:lazy_at] = self.lazy_runtime_lines()
+        
+        # Goes in last since the manifest is only complete once every element is written
+        preload = self.config.get('preload', 'none')
+        if preload in ('blocking', 'background'):
+            g.lines[preload_at:preload_at] = self.preload_lines(preload)
+    
+    def write_behaviors(self):
+        """Write the drag and destroy-key code, which refers to main and screenGui"""
+        g = self.gen
+        
+        # Add draggable functionality if requested
+        if self.config.get('draggable'):
+            g.w("-- Draggable functionality")
+            g.w("local UIS = game:GetService('UserInputService')")
+            g.w("local dragging, dragInput, dragStart, startPos")
+            g.w("")
+            g.w("main.InputBegan:Connect(function(input)")
+            g.w("\tif input.UserInputType == Enum.UserInputType.MouseButton1 or input.UserInputType == Enum.UserInputType.Touch then")
+            g.w("\t\tdragging = true")
+            g.w("\t\tdragStart = input.Position")
+            g.w("\t\tstartPos = main.Position")
+            g.w("\t\tinput.Changed:Connect(function()")
+            g.w("\t\t\tif input.UserInputState == Enum.UserInputState.End then")
+            g.w("\t\t\t\tdragging = false")
+            g.w("\t\t\tend")
+            g.w("\t\tend)")
+            g.w("\tend")
+            g.w("end)")
+            g.w("")
+            g.w("main.InputChanged:Connect(function(input)")
+            g.w("\tif input.UserInputType == Enum.UserInputType.MouseMovement or input.UserInputType == Enum.UserInputType.Touch then")
+            g.w("\t\tdragInput = input")
+            g.w("\tend")
+            g.w("end)")
+            g.w("")
+            g.w("UIS.InputChanged:Connect(function(input)")
+            g.w("\tif input == dragInput and dragging then")
+            g.w("\t\tlocal delta = input.Position - dragStart")
+            g.w("\t\tmain.Position = UDim2.new(startPos.X.Scale, startPos.X.Offset + delta.X, startPos.Y.Scale, startPos.Y.Offset + delta.Y)")
+            g.w("\tend")
+            g.w("end)")
+            g.w("")
+        
+        # Add destroy key if requested
+        destroy_key = self.config.get('destroykey', 'none')
+        key_map = {
+            'x': 'X', 'delete': 'Delete', 'backspace': 'Backspace',
+            'escape': 'Escape', 'p': 'P', 'm': 'M', 'k': 'K',
+            'f1': 'F1', 'f2': 'F2', 'f3': 'F3', 'f4': 'F4'
+        }
+        
+        if destroy_key in key_map:
+            g.w("-- Destroy key binding")
+            g.w("game:GetService('UserInputService').InputBegan:Connect(function(input, gameProcessed)")
+            g.w(f"\tif not gameProcessed and input.KeyCode == Enum.KeyCode.{key_map[destroy_key]} then")
+            g.w("\t\tscreenGui:Destroy()")
+            g.w("\tend")
+            g.w("end)")
+
+
+def create_pool(workers):
+    """Start the long-lived pool for UniversalConverter(pool=...); None when it can't be used
+
+    Call it once at startup, before any other threads exist: the workers are
+    forked, and forking a multi-threaded process can deadlock the children.
+    Workers keep the converter code they were forked with.
+    """
+    # multiprocessing is slow to import, so only callers that want a pool load it
+    import multiprocessing
+    if workers < 2 or 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork').Pool(workers)
+
+
+def generate_unit(packed, config, parent_var, indent, zindex, names):
+    """Worker entry point: write planned subtrees as the sequential path would"""
+    conv = UniversalConverter()
+    conv.set_config(**config)
+    conv.gen = LuaCodeGenerator(config.get('scale', 1.0), names)
+    conv.gen.indent = indent
+    conv.zindex = zindex
+    for item in RBXMLParser.unpack(packed, compress=False):
+        conv.write_element(item, parent_var)
+    lines = conv.gen.lines
+    # The caller keeps the trailing blank line so builder functions close the same way
+    if lines and lines[-1] == '':
+        lines.pop()
+    return lines
@@ -0,0 +1,330 @@
+"""Output backends: Lua source and binary RBXM models"""
+import re
+import struct
+
+from .parsers import RBXMBinaryParser
+
+
+class LuaCodeGenerator:
+    """Generates clean Lua code in the target style"""
+    
+    WEIGHT_MAP = {
+        '100': 'Thin', '200': 'ExtraLight', '300': 'Light', '400': 'Regular',
+        '500': 'Medium', '600': 'SemiBold', '700': 'Bold', '800': 'ExtraBold', '900': 'Heavy'
+    }
+    
+    def __init__(self, scale=1.0, names=None):
+        self.scale = scale
+        self.lines = []
+        self.indent = 0
+        self.var_counter = 0
+        self.used_names = set()
+        self.next_suffix = {}
+        # Parallel generation: names handed out by the planning pass, and a log to record them
+        self.assigned = iter(names) if names is not None else None
+        self.name_log = None
+    
+    def w(self, line=''):
+        self.lines.append('\t' * self.indent + line if line else '')
+    
+    def get_output(self):
+        return '\n'.join(self.lines)
+    
+    def make_var_name(self, name, cls):
+        """Create a clean variable name"""
+        if self.assigned is not None:
+            return next(self.assigned)
+        
+        if name:
+            # Clean the name for use as variable
+            clean = re.sub(r'[^a-zA-Z0-9]', '', name)
+            if clean and not clean[0].isdigit():
+                base = clean[0].lower() + clean[1:] if clean else cls.lower()
+            else:
+                base = cls.lower()
+        else:
+            base = cls.lower()
+        
+        # Ensure uniqueness, resuming from the last suffix tried for this base
+        var = base
+        if var in self.used_names:
+            counter = self.next_suffix.get(base, 1)
+            var = f"{base}{counter}"
+            while var in self.used_names:
+                counter += 1
+                var = f"{base}{counter}"
+            self.next_suffix[base] = counter + 1
+        self.used_names.add(var)
+        if self.name_log is not None:
+            self.name_log.append(var)
+        return var
+    
+    def scale_int(self, val):
+        return int(val * self.scale)
+    
+    def fmt_color3(self, color):
+        return f"Color3.new({round(color[0], 6)}, {round(color[1], 6)}, {round(color[2], 6)})"
+    
+    def fmt_udim2(self, u, scale_offsets=True):
+        xo = self.scale_int(u['xo']) if scale_offsets else int(u['xo'])
+        yo = self.scale_int(u['yo']) if scale_offsets else int(u['yo'])
+        return f"UDim2.new({u['xs']}, {xo}, {u['ys']}, {yo})"
+    
+    def fmt_udim(self, u, scale_offset=True):
+        o = self.scale_int(u['o']) if scale_offset else int(u['o'])
+        return f"UDim.new({u['s']}, {o})"
+    
+    def escape_string(self, s):
+        if not s:
+            return ''
+        return s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '')
+
+
+class RBXMModelWriter(LuaCodeGenerator):
+    """Builds a binary RBXM model from the statements the converter writes"""
+    
+    MAGIC = RBXMBinaryParser.MAGIC
+    
+    LOADER_HEADER = [
+        "-- Behavior for the converted GUI; runs once the ScreenGui reaches PlayerGui",
+        "local screenGui = script.Parent",
+        "local main = screenGui:WaitForChild('Main')",
+        "",
+    ]
+    
+    NEW_RE = re.compile(r"local (\w+) = Instance\.new\('(\w+)'\)$")
+    SET_RE = re.compile(r"(\w+)\.(\w+) = (.+)$")
+    CALL_RE = re.compile(r"\w+\.new\((.*)\)$")
+    FONT_RE = re.compile(r'Font\.new\("(.*)", Enum\.FontWeight\.(\w+), Enum\.FontStyle\.(\w+)\)$')
+    ESCAPE_RE = re.compile(r'\\(.)')
+    
+    # Binary type ids, as read back by RBXMBinaryParser.read_values
+    TYPE_IDS = {
+        'string': 0x01, 'bool': 0x02, 'int': 0x03, 'float': 0x04, 'UDim': 0x06, 'UDim2': 0x07,
+        'Color3': 0x0C, 'Vector2': 0x0E, 'token': 0x12, 'Font': 0x20,
+    }
+    
+    # Type of every property the converter assigns
+    PROPERTY_TYPES = {
+        'Name': 'string', 'Text': 'string', 'PlaceholderText': 'string', 'Image': 'string', 'Source': 'string',
+        'ClipsDescendants': 'bool', 'Visible': 'bool', 'TextWrapped': 'bool', 'TextScaled': 'bool',
+        'RichText': 'bool', 'ClearTextOnFocus': 'bool', 'AutoButtonColor': 'bool', 'ResetOnSpawn': 'bool',
+        'BorderSizePixel': 'int', 'LayoutOrder': 'int', 'ZIndex': 'int', 'ScrollBarThickness': 'int',
+        'BackgroundTransparency': 'float', 'TextTransparency': 'float', 'ImageTransparency': 'float',
+        'Transparency': 'float', 'Thickness': 'float', 'TextSize': 'float',
+        'CornerRadius': 'UDim', 'Padding': 'UDim', 'PaddingTop': 'UDim', 'PaddingBottom': 'UDim',
+        'PaddingLeft': 'UDim', 'PaddingRight': 'UDim',
+        'Size': 'UDim2', 'Position': 'UDim2', 'CanvasSize': 'UDim2', 'CellSize': 'UDim2', 'CellPadding': 'UDim2',
+        'BackgroundColor3': 'Color3', 'TextColor3': 'Color3', 'ImageColor3': 'Color3', 'Color': 'Color3',
+        'AnchorPoint': 'Vector2',
+        'TextXAlignment': 'token', 'TextYAlignment': 'token', 'SortOrder': 'token', 'FillDirection': 'token',
+        'HorizontalAlignment': 'token', 'VerticalAlignment': 'token', 'ScaleType': 'token',
+        'ApplyStrokeMode': 'token', 'LineJoinMode': 'token', 'StartCorner': 'token', 'ZIndexBehavior': 'token',
+        'FontFace': 'Font',
+    }
+    
+    # Roblox enum item values by name
+    ENUM_VALUES = {
+        'TextXAlignment': {'Left': 0, 'Right': 1, 'Center': 2},
+        'TextYAlignment': {'Top': 0, 'Center': 1, 'Bottom': 2},
+        'SortOrder': {'Name': 0, 'Custom': 1, 'LayoutOrder': 2},
+        'FillDirection': {'Horizontal': 0, 'Vertical': 1},
+        'HorizontalAlignment': {'Center': 0, 'Left': 1, 'Right': 2},
+        'VerticalAlignment': {'Center': 0, 'Top': 1, 'Bottom': 2},
+        'ScaleType': {'Stretch': 0, 'Slice': 1, 'Tile': 2, 'Fit': 3, 'Crop': 4},
+        'ApplyStrokeMode': {'Contextual': 0, 'Border': 1},
+        'LineJoinMode': {'Round': 0, 'Bevel': 1, 'Miter': 2},
+        'StartCorner': {'TopLeft': 0, 'TopRight': 1, 'BottomLeft': 2, 'BottomRight': 3},
+        'ZIndexBehavior': {'Global': 0, 'Sibling': 1},
+        'FontStyle': {'Normal': 0, 'Italic': 1},
+    }
+    
+    # Values for instances that never had a property assigned, matching Instance.new
+    DEFAULTS = {
+        'string': '', 'bool': False, 'int': 0, 'float': 0.0, 'UDim': (0.0, 0),
+        'UDim2': (0.0, 0, 0.0, 0), 'Color3': (0.0, 0.0, 0.0), 'Vector2': (0.0, 0.0), 'token': 0,
+        'Font': ('rbxasset://fonts/families/SourceSansPro.json', 400, 0),
+        'Visible': True, 'BorderSizePixel': 1, 'ZIndex': 1, 'TextSize': 14.0, 'Thickness': 1.0,
+        'ClearTextOnFocus': True, 'AutoButtonColor': True, 'ResetOnSpawn': True, 'ScrollBarThickness': 12,
+        'Size': (0.0, 100, 0.0, 100), 'CanvasSize': (0.0, 0, 2.0, 0), 'CornerRadius': (0.0, 8),
+        'CellSize': (0.0, 100, 0.0, 100), 'CellPadding': (0.0, 5, 0.0, 5),
+        'BackgroundColor3': (163 / 255, 162 / 255, 165 / 255), 'TextColor3': (27 / 255, 42 / 255, 53 / 255),
+        'ImageColor3': (1.0, 1.0, 1.0),
+        'TextXAlignment': 2, 'TextYAlignment': 1, 'SortOrder': 2, 'HorizontalAlignment': 1,
+        'VerticalAlignment': 1, 'FillDirection': 1, 'ZIndexBehavior': 0,
+    }
+    CLASS_DEFAULTS = {
+        ('TextLabel', 'Size'): (0.0, 200, 0.0, 50), ('TextButton', 'Size'): (0.0, 200, 0.0, 50),
+        ('TextBox', 'Size'): (0.0, 200, 0.0, 50), ('TextLabel', 'Text'): 'Label',
+        ('TextButton', 'Text'): 'Button', ('TextBox', 'Text'): 'TextBox',
+        ('ScrollingFrame', 'ClipsDescendants'): True, ('UIGridLayout', 'FillDirection'): 0,
+    }
+    
+    def __init__(self, scale=1.0, names=None):
+        super().__init__(scale, names)
+        self.loader = None
+    
+    def add_loader(self, lines):
+        """Attach a LocalScript with the given source to the ScreenGui"""
+        self.loader = '\n'.join(lines)
+    
+    def get_output(self):
+        return self.serialize(*self.build_instances())
+    
+    def build_instances(self):
+        """Replay the written statements into (classes, props, parents) per referent"""
+        classes, props, parents = [], [], []
+        refs = {}
+        for line in self.lines:
+            line = line.strip()
+            match = self.NEW_RE.match(line)
+            if match:
+                var, cls = match.groups()
+                refs[var] = len(classes)
+                classes.append(cls)
+                props.append({})
+                parents.append(-1)
+                continue
+            match = self.SET_RE.match(line)
+            if not match or match.group(1) not in refs:
+                continue
+            var, name, expr = match.groups()
+            ref = refs[var]
+            if name == 'Parent':
+                # Anything that isn't one of ours (playerGui) makes this a model root
+                parents[ref] = refs.get(expr, -1)
+                continue
+            props[ref][name] = self.read_expr(name, expr)
+        
+        if self.loader is not None:
+            classes.append('LocalScript')
+            props.append({'Name': 'Loader', 'Source': self.loader})
+            # The ScreenGui is always the first instance created
+            parents.append(0)
+        return classes, props, parents
+    
+    def read_expr(self, name, expr):
+        """Turn a Lua value expression into a typed property value; raises ValueError if unsupported"""
+        tag = self.PROPERTY_TYPES.get(name)
+        if tag is None:
+            raise ValueError(f"Cannot export property {name} to a binary model")
+        try:
+            if tag == 'string':
+                if len(expr) < 2 or expr[0] not in '"\'' or expr[-1] != expr[0]:
+                    raise ValueError("not a string literal")
+                # Only escape_string output (double-quoted) is escaped; single-quoted text is written raw
+                if expr[0] == "'":
+                    return expr[1:-1]
+                return self.ESCAPE_RE.sub(lambda m: '\n' if m.group(1) == 'n' else m.group(1), expr[1:-1])
+            if tag == 'bool':
+                if expr not in ('true', 'false'):
+                    raise ValueError("not a boolean literal")
+                return expr == 'true'
+            if tag == 'int':
+                return int(float(expr))
+            if tag == 'float':
+                return float(expr)
+            if tag == 'token':
+                _, enum_type, item = expr.split('.')
+                return self.ENUM_VALUES[enum_type][item]
+            if tag == 'Font':
+                url, weight, style = self.FONT_RE.match(expr).groups()
+                weights = {v: int(k) for k, v in self.WEIGHT_MAP.items()}
+                return (url, weights[weight], self.ENUM_VALUES['FontStyle'][style])
+            args = [float(a) for a in self.CALL_RE.match(expr).group(1).split(',')]
+            if len(args) != {'UDim': 2, 'UDim2': 4, 'Color3': 3, 'Vector2': 2}[tag]:
+                raise ValueError("wrong number of components")
+            if tag == 'UDim':
+                return (args[0], int(args[1]))
+            if tag == 'UDim2':
+                return (args[0], int(args[1]), args[2], int(args[3]))
+            return tuple(args)
+        except (ValueError, KeyError, AttributeError, IndexError) as e:
+            raise ValueError(f"Cannot export {name} = {expr} to a binary model ({type(e).__name__})") from None
+    
+    def serialize(self, classes, props, parents):
+        """Encode instances as an LZ4-compressed binary model"""
+        by_class = {}
+        for ref, cls in enumerate(classes):
+            by_class.setdefault(cls, []).append(ref)
+        
+        out = [self.MAGIC, struct.pack('<HII', 0, len(by_class), len(classes)), bytes(8)]
+        ordered = sorted(by_class.items())
+        for class_id, (cls, refs) in enumerate(ordered):
+            out.append(self.chunk(b'INST', struct.pack('<I', class_id) + self.write_string(cls) + b'\0'
+                                  + struct.pack('<I', len(refs)) + self.write_referents(refs)))
+        for class_id, (cls, refs) in enumerate(ordered):
+            names = {}
+            for ref in refs:
+                names.update(dict.fromkeys(props[ref]))
+            for name in names:
+                tag = self.PROPERTY_TYPES[name]
+                if name == 'Name':
+                    default = cls
+                else:
+                    default = self.CLASS_DEFAULTS.get((cls, name), self.DEFAULTS.get(name, self.DEFAULTS[tag]))
+                values = [props[ref].get(name, default) for ref in refs]
+                out.append(self.chunk(b'PROP', struct.pack('<I', class_id) + self.write_string(name)
+                                      + bytes([self.TYPE_IDS[tag]]) + self.write_values(tag, values)))
+        count = len(classes)
+        out.append(self.chunk(b'PRNT', b'\0' + struct.pack('<I', count)
+                              + self.write_referents(range(count)) + self.write_referents(parents)))
+        out.append(b'END\0' + struct.pack('<III', 0, 9, 0) + b'</roblox>')
+        return b''.join(out)
+    
+    @staticmethod
+    def chunk(name, data):
+        import lz4.block
+        packed = lz4.block.compress(data, store_size=False)
+        return name + struct.pack('<III', len(packed), len(data), 0) + packed
+    
+    @staticmethod
+    def write_string(s):
+        data = s.encode('utf-8')
+        return struct.pack('<I', len(data)) + data
+    
+    @staticmethod
+    def write_interleaved(values):
+        """Write big-endian integers byte-plane by byte-plane"""
+        raw = struct.pack(f'>{len(values)}I', *values)
+        return b''.join(raw[i::4] for i in range(4))
+    
+    @classmethod
+    def write_ints(cls, values):
+        return cls.write_interleaved([((v << 1) ^ (v >> 31)) & 0xFFFFFFFF for v in values])
+    
+    @classmethod
+    def write_referents(cls, refs):
+        refs = list(refs)
+        return cls.write_ints([b - a for a, b in zip([0] + refs, refs)])
+    
+    @classmethod
+    def write_floats(cls, values):
+        bits = struct.unpack(f'<{len(values)}I', struct.pack(f'<{len(values)}f', *values))
+        # Roblox floats keep the sign in the lowest bit
+        return cls.write_interleaved([((b << 1) | (b >> 31)) & 0xFFFFFFFF for b in bits])
+    
+    @classmethod
+    def write_values(cls, tag, values):
+        """Encode a whole property column"""
+        if tag == 'string':
+            return b''.join(cls.write_string(v) for v in values)
+        if tag == 'bool':
+            return bytes(1 if v else 0 for v in values)
+        if tag == 'int':
+            return cls.write_ints(values)
+        if tag == 'float':
+            return cls.write_floats(values)
+        if tag == 'token':
+            return cls.write_interleaved(values)
+        if tag == 'UDim':
+            return cls.write_floats([v[0] for v in values]) + cls.write_ints([v[1] for v in values])
+        if tag == 'UDim2':
+            return b''.join(cls.write_floats([v[i] for v in values]) for i in (0, 2)) + \
+                b''.join(cls.write_ints([v[i] for v in values]) for i in (1, 3))
+        if tag in ('Color3', 'Vector2'):
+            return b''.join(cls.write_floats([v[i] for v in values]) for i in range(len(values[0])))
+        if tag == 'Font':
+            return b''.join(cls.write_string(url) + struct.pack('<HB', weight, style) + cls.write_string('')
+                            for url, weight, style in values)
+        raise ValueError(f"Unsupported property type {tag}")
@@ -0,0 +1,401 @@
+"""Readers for RBXMX (XML) and binary RBXM models, producing Items"""
+import xml.etree.ElementTree as ET
+import marshal
+import zlib
+import struct
+import itertools
+import functools
+from collections import namedtuple
+
+
+# Parsed form shared by every input path: props maps (name, tag) to a decoded value
+Item = namedtuple('Item', 'cls props children size')
+
+
+class RBXMLParser:
+    """Parses RBXMX XML and extracts properties"""
+    
+    @staticmethod
+    def read_color3(p):
+        return (float(p.findtext('R') or 0), float(p.findtext('G') or 0), float(p.findtext('B') or 0))
+    
+    @staticmethod
+    def read_color3uint8(p):
+        val = int(p.text)
+        return ((val >> 16 & 0xFF) / 255, (val >> 8 & 0xFF) / 255, (val & 0xFF) / 255)
+    
+    @staticmethod
+    def read_udim2(p):
+        return {
+            'xs': float(p.findtext('XS') or 0),
+            'xo': float(p.findtext('XO') or 0),
+            'ys': float(p.findtext('YS') or 0),
+            'yo': float(p.findtext('YO') or 0)
+        }
+    
+    @staticmethod
+    def read_udim(p):
+        return {
+            's': float(p.findtext('S') or 0),
+            'o': float(p.findtext('O') or 0)
+        }
+    
+    @staticmethod
+    def read_vector2(p):
+        return (float(p.findtext('X') or 0), float(p.findtext('Y') or 0))
+    
+    @staticmethod
+    def read_font(p):
+        fam = p.find('Family')
+        url = 'rbxasset://fonts/families/SourceSansPro.json'
+        if fam is not None:
+            u = fam.find('url')
+            if u is not None and u.text:
+                url = u.text
+        weight = p.findtext('Weight') or '400'
+        style = p.findtext('Style') or 'Normal'
+        return {'url': url, 'weight': weight, 'style': style}
+    
+    @staticmethod
+    def read_content(p):
+        u = p.find('url')
+        if u is not None and u.text and u.text not in ['', 'undefined', 'null']:
+            return u.text
+        return None
+    
+    # Property tags the converter reads; empty values decode to None like a missing property
+    READERS = {
+        'string': lambda p: p.text or None,
+        'bool': lambda p: p.text == 'true',
+        'float': lambda p: float(p.text) if p.text else None,
+        'double': lambda p: float(p.text) if p.text else None,
+        'int': lambda p: int(p.text) if p.text else None,
+        'token': lambda p: int(p.text) if p.text else None,
+        'Color3': read_color3,
+        'Color3uint8': lambda p: RBXMLParser.read_color3uint8(p) if p.text else None,
+        'UDim2': read_udim2,
+        'UDim': read_udim,
+        'Vector2': read_vector2,
+        'Font': read_font,
+        'Content': read_content,
+    }
+    
+    @classmethod
+    def parse(cls, xml_str):
+        """Parse RBXMX text into top-level Items; raises ET.ParseError"""
+        root = ET.fromstring(xml_str)
+        items = root.findall('Item')
+        if not items:
+            for child in root:
+                items.extend(child.findall('Item'))
+        return [cls.read_item(item) for item in items]
+    
+    @classmethod
+    def read_item(cls, el):
+        props = {}
+        props_el = el.find('Properties')
+        for p in props_el if props_el is not None else ():
+            reader = cls.READERS.get(p.tag)
+            key = (p.get('name'), p.tag)
+            if reader is None or key in props:
+                continue
+            try:
+                props[key] = reader(p)
+            except ValueError:
+                # Malformed values are treated as missing
+                continue
+        children = [cls.read_item(child) for child in el.findall('Item')]
+        return Item(el.get('class'), props, children, 1 + sum(c.size for c in children))
+    
+    @staticmethod
+    def pack(items, compress=True):
+        """Serialize parsed Items for the store, or uncompressed for worker pipes"""
+        def plain(item):
+            return (item.cls, item.props, [plain(c) for c in item.children], item.size)
+        data = marshal.dumps([plain(i) for i in items])
+        return zlib.compress(data, 1) if compress else data
+    
+    @staticmethod
+    def unpack(data, compress=True):
+        """Rebuild parsed Items from pack() output"""
+        def build(t):
+            return Item(t[0], t[1], [build(c) for c in t[2]], t[3])
+        if compress:
+            data = zlib.decompress(data)
+        return [build(t) for t in marshal.loads(data)]
+    
+    @staticmethod
+    def get_prop(props, name, tag):
+        if props is None:
+            return None
+        return props.get((name, tag))
+    
+    @staticmethod
+    def get_string(props, name):
+        return RBXMLParser.get_prop(props, name, 'string')
+    
+    @staticmethod
+    def get_bool(props, name):
+        return RBXMLParser.get_prop(props, name, 'bool')
+    
+    @staticmethod
+    def get_float(props, name):
+        val = RBXMLParser.get_prop(props, name, 'float')
+        if val is not None:
+            return val
+        return RBXMLParser.get_prop(props, name, 'double')
+    
+    @staticmethod
+    def get_int(props, name):
+        return RBXMLParser.get_prop(props, name, 'int')
+    
+    @staticmethod
+    def get_token(props, name):
+        return RBXMLParser.get_prop(props, name, 'token')
+    
+    @staticmethod
+    def get_color3(props, name):
+        # Try Color3 format, then Color3uint8
+        if props is None:
+            return None
+        if (name, 'Color3') in props:
+            return props[(name, 'Color3')]
+        return props.get((name, 'Color3uint8'))
+    
+    @staticmethod
+    def get_udim2(props, name):
+        return RBXMLParser.get_prop(props, name, 'UDim2')
+    
+    @staticmethod
+    def get_udim(props, name):
+        return RBXMLParser.get_prop(props, name, 'UDim')
+    
+    @staticmethod
+    def get_vector2(props, name):
+        return RBXMLParser.get_prop(props, name, 'Vector2')
+    
+    @staticmethod
+    def get_font(props, name):
+        return RBXMLParser.get_prop(props, name, 'Font')
+    
+    @staticmethod
+    def get_content(props, name):
+        return RBXMLParser.get_prop(props, name, 'Content')
+
+
+class BinaryModelError(ValueError):
+    """A binary RBXM file that could not be read"""
+
+
+class RBXMBinaryParser:
+    """Parses binary RBXM models into the same Items as RBXMLParser"""
+    
+    MAGIC = b'<roblox!\x89\xff\r\n\x1a\n'
+    ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+    
+    # String-typed properties that RBXMX stores as Content
+    CONTENT_PROPS = {'Image', 'HoverImage', 'PressedImage'}
+    FONT_STYLES = {0: 'Normal', 1: 'Italic'}
+    
+    # Chunk headers claiming more than this, or more than LZ4 can expand to, are corrupt
+    MAX_CHUNK_SIZE = 256 * 1024 * 1024
+    LZ4_MAX_RATIO = 255
+    
+    @classmethod
+    def parse(cls, data):
+        """Parse RBXM bytes into top-level Items; raises BinaryModelError on bad input"""
+        # Imported on first use so XML-only callers never load it
+        import lz4.block
+        try:
+            return cls.read_model(memoryview(data))
+        except BinaryModelError:
+            raise
+        except (struct.error, KeyError, IndexError, ValueError, OverflowError, MemoryError,
+                lz4.block.LZ4BlockError) as e:
+            raise BinaryModelError(f"Corrupt binary model file ({type(e).__name__})")
+    
+    @classmethod
+    def read_model(cls, buf):
+        if bytes(buf[:14]) != cls.MAGIC:
+            raise BinaryModelError("Not a binary Roblox model file")
+        
+        classes = {}    # class id -> (class name, referents)
+        props = {}      # referent -> {(name, tag): value}
+        parents = {}    # referent -> parent referent
+        order = []      # referents in parent-chunk order
+        
+        pos = 32
+        while pos + 16 <= len(buf):
+            name = bytes(buf[pos:pos + 4])
+            compressed, size = struct.unpack_from('<II', buf, pos + 4)
+            pos += 16
+            # The payload is `compressed` bytes long, or `size` when stored uncompressed
+            if (compressed or size) > len(buf) - pos or size > cls.MAX_CHUNK_SIZE:
+                raise BinaryModelError(f"Corrupt binary model file (bad {name!r} chunk size)")
+            if compressed:
+                chunk = memoryview(cls.decompress(buf[pos:pos + compressed], size))
+                pos += compressed
+            else:
+                chunk = buf[pos:pos + size]
+                pos += size
+            
+            if name == b'INST':
+                class_id, = struct.unpack_from('<I', chunk, 0)
+                class_name, at = cls.read_string(chunk, 4)
+                count, = struct.unpack_from('<I', chunk, at + 1)
+                refs = cls.read_referents(chunk, at + 5, count)
+                classes[class_id] = (class_name, refs)
+                for ref in refs:
+                    props[ref] = {}
+            elif name == b'PROP':
+                class_id, = struct.unpack_from('<I', chunk, 0)
+                prop_name, at = cls.read_string(chunk, 4)
+                refs = classes[class_id][1]
+                decoded = cls.read_values(chunk, at + 1, chunk[at], len(refs), prop_name)
+                if decoded is not None:
+                    tag, values = decoded
+                    for ref, value in zip(refs, values):
+                        props[ref][(prop_name, tag)] = value
+            elif name == b'PRNT':
+                count, = struct.unpack_from('<I', chunk, 1)
+                children = cls.read_referents(chunk, 5, count)
+                for child, parent in zip(children, cls.read_referents(chunk, 5 + 4 * count, count)):
+                    parents[child] = parent
+                    order.append(child)
+            elif name == b'END\0':
+                break
+        else:
+            # Every complete model ends with an END chunk
+            raise BinaryModelError("Truncated binary model file")
+        
+        class_of = {}
+        for class_name, refs in classes.values():
+            for ref in refs:
+                class_of[ref] = class_name
+        kids = {}
+        roots = []
+        for ref in order:
+            parent = parents[ref]
+            if parent in class_of:
+                kids.setdefault(parent, []).append(ref)
+            else:
+                roots.append(ref)
+        
+        def build(ref):
+            children = [build(child) for child in kids.get(ref, ())]
+            return Item(class_of[ref], props[ref], children, 1 + sum(c.size for c in children))
+        
+        return [build(ref) for ref in roots]
+    
+    @classmethod
+    def decompress(cls, data, size):
+        if bytes(data[:4]) == cls.ZSTD_MAGIC:
+            try:
+                import zstandard
+            except ImportError:
+                raise BinaryModelError("This model uses ZSTD compression; install the zstandard package")
+            return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+        if size > len(data) * cls.LZ4_MAX_RATIO:
+            raise BinaryModelError("Corrupt binary model file (bad chunk size)")
+        import lz4.block
+        return lz4.block.decompress(data, uncompressed_size=size)
+    
+    @staticmethod
+    def read_string(buf, pos):
+        length, = struct.unpack_from('<I', buf, pos)
+        return str(buf[pos + 4:pos + 4 + length], 'utf-8', 'replace'), pos + 4 + length
+    
+    @staticmethod
+    def read_interleaved(buf, pos, count, width=4):
+        """Read big-endian integers stored byte-plane by byte-plane"""
+        if pos + count * width > len(buf):
+            raise IndexError("interleaved array runs past the chunk")
+        raw = bytearray(count * width)
+        for i in range(width):
+            raw[i::width] = buf[pos + i * count:pos + (i + 1) * count]
+        return struct.unpack(f'>{count}{"I" if width == 4 else "Q"}', raw)
+    
+    @classmethod
+    def read_ints(cls, buf, pos, count):
+        return [(v >> 1) ^ -(v & 1) for v in cls.read_interleaved(buf, pos, count)]
+    
+    @classmethod
+    def read_referents(cls, buf, pos, count):
+        refs = cls.read_ints(buf, pos, count)
+        return list(itertools.accumulate(refs))
+    
+    @classmethod
+    def read_floats(cls, buf, pos, count):
+        # Roblox floats keep the sign in the lowest bit
+        bits = [(v >> 1) | ((v & 1) << 31) for v in cls.read_interleaved(buf, pos, count)]
+        return [short_float32(b) for b in bits]
+    
+    @classmethod
+    def read_values(cls, buf, pos, type_id, n, prop_name):
+        """Decode a whole property column; returns (tag, values) or None if unused"""
+        if type_id == 0x01:
+            values = []
+            for _ in range(n):
+                s, pos = cls.read_string(buf, pos)
+                values.append(s)
+            if prop_name in cls.CONTENT_PROPS:
+                return 'Content', [s if s not in ['', 'undefined', 'null'] else None for s in values]
+            return 'string', [s or None for s in values]
+        if type_id == 0x02:
+            return 'bool', [b != 0 for b in buf[pos:pos + n]]
+        if type_id == 0x03:
+            return 'int', cls.read_ints(buf, pos, n)
+        if type_id == 0x04:
+            return 'float', cls.read_floats(buf, pos, n)
+        if type_id == 0x05:
+            return 'double', list(struct.unpack_from(f'<{n}d', buf, pos))
+        if type_id == 0x06:
+            scales = cls.read_floats(buf, pos, n)
+            offsets = cls.read_ints(buf, pos + 4 * n, n)
+            return 'UDim', [{'s': s, 'o': float(o)} for s, o in zip(scales, offsets)]
+        if type_id == 0x07:
+            xs = cls.read_floats(buf, pos, n)
+            ys = cls.read_floats(buf, pos + 4 * n, n)
+            xo = cls.read_ints(buf, pos + 8 * n, n)
+            yo = cls.read_ints(buf, pos + 12 * n, n)
+            return 'UDim2', [{'xs': a, 'xo': float(b), 'ys': c, 'yo': float(d)}
+                             for a, b, c, d in zip(xs, xo, ys, yo)]
+        if type_id == 0x0C:
+            r = cls.read_floats(buf, pos, n)
+            g = cls.read_floats(buf, pos + 4 * n, n)
+            b = cls.read_floats(buf, pos + 8 * n, n)
+            return 'Color3', list(zip(r, g, b))
+        if type_id == 0x0E:
+            x = cls.read_floats(buf, pos, n)
+            y = cls.read_floats(buf, pos + 4 * n, n)
+            return 'Vector2', list(zip(x, y))
+        if type_id == 0x12:
+            return 'token', list(cls.read_interleaved(buf, pos, n))
+        if type_id == 0x1A:
+            r, g, b = buf[pos:pos + n], buf[pos + n:pos + 2 * n], buf[pos + 2 * n:pos + 3 * n]
+            return 'Color3uint8', [(x / 255, y / 255, z / 255) for x, y, z in zip(r, g, b)]
+        if type_id == 0x20:
+            values = []
+            for _ in range(n):
+                url, pos = cls.read_string(buf, pos)
+                weight, style = struct.unpack_from('<HB', buf, pos)
+                _, pos = cls.read_string(buf, pos + 3)
+                values.append({
+                    'url': url or 'rbxasset://fonts/families/SourceSansPro.json',
+                    'weight': str(weight),
+                    'style': cls.FONT_STYLES.get(style, 'Normal')
+                })
+            return 'Font', values
+        return None
+
+
+@functools.lru_cache(maxsize=65536)
+def short_float32(bits):
+    """Shortest decimal that round-trips a float32, as RBXMX writes it"""
+    packed = struct.pack('<I', bits)
+    value = struct.unpack('<f', packed)[0]
+    for digits in range(1, 10):
+        short = float(f'{value:.{digits}g}')
+        if struct.pack('<f', short) == packed:
+            return short
+    return value
@@ -0,0 +1,219 @@
+"""Offline load test: drive !convert through fake Discord objects at several concurrency levels
+
+Usage: python loadtest.py --concurrency 1,10,50 --requests 100 --elements 2000 --delay-ms 50
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+
+def make_rbxmx(elements, seed=0):
+    """Build a synthetic RBXMX document with roughly `elements` items"""
+    rnd = random.Random(seed)
+    count = 0
+
+    def udim2(xs, xo, ys, yo):
+        return f'<XS>{xs}</XS><XO>{xo}</XO><YS>{ys}</YS><YO>{yo}</YO>'
+
+    def item(depth):
+        nonlocal count
+        count += 1
+        cls = rnd.choice(['Frame', 'Frame', 'TextLabel', 'TextButton', 'ImageLabel',
+                          'ScrollingFrame', 'UICorner', 'UIStroke', 'UIListLayout'])
+        props = [
+            f'<string name="Name">{cls}{count}</string>',
+            f'<UDim2 name="Size">{udim2(0, rnd.randint(20, 300), 0, rnd.randint(20, 300))}</UDim2>',
+            f'<UDim2 name="Position">{udim2(0, rnd.randint(0, 400), 0, rnd.randint(0, 400))}</UDim2>',
+            f'<Color3 name="BackgroundColor3"><R>{rnd.random():.4f}</R><G>0.2</G><B>0.3</B></Color3>',
+            f'<float name="BackgroundTransparency">{rnd.choice([0, 0.5, 1])}</float>',
+            '<int name="BorderSizePixel">0</int>',
+            f'<bool name="Visible">{"false" if rnd.random() < 0.1 else "true"}</bool>',
+            f'<string name="Text">Label {count}</string>',
+            '<Color3uint8 name="TextColor3">16777215</Color3uint8>',
+            '<float name="TextSize">18</float>',
+            '<Font name="FontFace"><Family><url>rbxasset://fonts/families/GothamSSm.json</url></Family>'
+            '<Weight>700</Weight><Style>Normal</Style></Font>',
+            f'<Content name="Image"><url>rbxassetid://{rnd.randint(1, 50)}</url></Content>',
+            '<UDim name="CornerRadius"><S>0</S><O>8</O></UDim>',
+            '<float name="Thickness">2</float>',
+        ]
+        children = ''
+        if depth < 6 and cls in ('Frame', 'ScrollingFrame'):
+            for _ in range(rnd.randint(0, 8)):
+                if count < elements:
+                    children += item(depth + 1)
+        return f'<Item class="{cls}" referent="RBX{count}"><Properties>{"".join(props)}</Properties>{children}</Item>'
+
+    body = ''
+    while count < elements:
+        body += item(0)
+    return f'<roblox version="4">{body}</roblox>'.encode('utf-8')
+
+
+class FakeMessage:
+    def __init__(self, content=None, embed=None, file=None, attachments=()):
+        self.content = content
+        self.embed = embed
+        self.file = file
+        self.attachments = list(attachments)
+
+    async def delete(self):
+        pass
+
+
+class FakeAttachment:
+    """Serves fixed bytes after a simulated download delay"""
+
+    def __init__(self, filename, data, delay=0.0):
+        self.filename = filename
+        self.data = data
+        self.delay = delay
+
+    async def read(self):
+        await asyncio.sleep(self.delay)
+        return self.data
+
+
+class FakeAuthor:
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class FakeContext:
+    """Stand-in for commands.Context that records every reply"""
+
+    def __init__(self, user_id, attachments=()):
+        self.author = FakeAuthor(user_id)
+        self.message = FakeMessage(attachments=attachments)
+        self.replies = []
+
+    async def send(self, content=None, **kwargs):
+        msg = FakeMessage(content, **kwargs)
+        self.replies.append(msg)
+        return msg
+
+
+async def monitor_loop(lag, rss, interval=0.01):
+    """Record how late the event loop wakes up from short sleeps, and sample memory each time"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag.append(time.perf_counter() - start - interval)
+        rss.append(sample_rss_mb())
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def process_rss_mb(pid='self'):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+
+def sample_rss_mb():
+    """Resident memory right now, for this process and for the pool workers together"""
+    workers = sum(process_rss_mb(p.pid) for p in multiprocessing.active_children())
+    return process_rss_mb(), workers
+
+
+async def run_level(bot, payload, concurrency, requests, delay, jitter):
+    """Run `requests` conversions with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+    lag, rss = [], [sample_rss_mb()]
+    monitor = asyncio.create_task(monitor_loop(lag, rss))
+
+    async def one(i):
+        async with semaphore:
+            att = FakeAttachment('load.rbxmx', payload, delay + random.uniform(0, jitter))
+            ctx = FakeContext(user_id=i, attachments=[att])
+            start = time.perf_counter()
+            await bot.convert_cmd(ctx)
+            latencies.append(time.perf_counter() - start)
+            last = ctx.replies[-1] if ctx.replies else None
+            if last is None or last.file is None:
+                errors.append(last.content if last else 'no reply')
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    monitor.cancel()
+
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'throughput': requests / elapsed,
+        'lag_p99': percentile(lag, 99),
+        'lag_max': max(lag) if lag else 0.0,
+        # Highest samples taken during this level, not the process lifetime peak
+        'rss': max(own for own, _ in rss),
+        'workers_rss': max(workers for _, workers in rss),
+    }
+
+
+async def main(args):
+    # The store is opened at import, so point it somewhere disposable first
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['PARSED_STORE_PATH'] = os.path.join(tmp.name, 'parsed_store.db')
+    os.environ['CONVERT_WORKERS'] = str(args.workers)
+    import bot
+    # Started here, before the event loop's worker threads, as bot.py's __main__ does
+    bot.pool = bot.converter.create_pool(args.workers)
+
+    payload = make_rbxmx(args.elements, args.seed)
+    print(f"Payload: {args.elements} elements, {len(payload) // 1024} KB, "
+          f"download delay {args.delay_ms}ms (+{args.jitter_ms}ms jitter)")
+    print(f"{'conc':>5} {'reqs':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'req/s':>7} {'lag p99':>8} {'lag max':>8} {'rss MB':>7} {'pool MB':>8}")
+    print("(rss/pool: peak of /proc samples taken during each level)")
+
+    for concurrency in args.concurrency:
+        requests = args.requests or concurrency * 4
+        r = await run_level(bot, payload, concurrency, requests, args.delay_ms / 1000, args.jitter_ms / 1000)
+        print(f"{r['concurrency']:>5} {r['requests']:>5} {r['errors']:>4} "
+              f"{r['p50'] * 1000:>8.1f} {r['p95'] * 1000:>8.1f} {r['p99'] * 1000:>8.1f} "
+              f"{r['throughput']:>7.2f} {r['lag_p99'] * 1000:>8.1f} {r['lag_max'] * 1000:>8.1f} "
+              f"{r['rss']:>7.1f} {r['workers_rss']:>8.1f}")
+        if r['first_error']:
+            print(f"      first error: {r['first_error']}")
+
+    if bot.pool is not None:
+        bot.pool.terminate()
+    tmp.cleanup()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', default='1,10,50',
+                        type=lambda s: [int(c) for c in s.split(',')],
+                        help='comma-separated concurrency levels (default: 1,10,50)')
+    parser.add_argument('--requests', type=int, default=0,
+                        help='requests per level (default: 4x concurrency)')
+    parser.add_argument('--elements', type=int, default=1000, help='items in the synthetic file')
+    parser.add_argument('--delay-ms', type=float, default=50, help='simulated download delay')
+    parser.add_argument('--jitter-ms', type=float, default=20, help='random extra download delay')
+    parser.add_argument('--workers', type=int, default=1, help='size of the shared conversion pool')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
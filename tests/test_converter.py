@@ -0,0 +1,237 @@
+"""Regression tests for the converter package
+
+Run from the repository root: python -m pytest tests
+"""
+import re
+import struct
+import unittest
+from unittest import mock
+
+import converter
+from converter import Item, RBXMBinaryParser, RBXMLParser, RBXMModelWriter, UniversalConverter
+from loadtest import make_rbxmx
+
+
+def encode_rbxm(items):
+    """Write parsed Items as a binary model using the writer's column helpers (see HAND_BUILT_RBXM)"""
+    w = RBXMModelWriter
+    type_ids = {'string': 0x01, 'Content': 0x01, 'bool': 0x02, 'int': 0x03, 'float': 0x04,
+                'UDim': 0x06, 'UDim2': 0x07, 'Color3': 0x0C, 'Vector2': 0x0E, 'token': 0x12,
+                'Color3uint8': 0x1A, 'Font': 0x20}
+
+    def column(tag, values):
+        if tag in ('string', 'Content'):
+            return b''.join(w.write_string(v or '') for v in values)
+        if tag == 'bool':
+            return bytes(values)
+        if tag == 'int':
+            return w.write_ints(values)
+        if tag == 'float':
+            return w.write_floats(values)
+        if tag == 'token':
+            return w.write_interleaved(values)
+        if tag == 'UDim':
+            return w.write_floats([v['s'] for v in values]) + w.write_ints([int(v['o']) for v in values])
+        if tag == 'UDim2':
+            return (w.write_floats([v['xs'] for v in values]) + w.write_floats([v['ys'] for v in values])
+                    + w.write_ints([int(v['xo']) for v in values]) + w.write_ints([int(v['yo']) for v in values]))
+        if tag in ('Color3', 'Vector2'):
+            return b''.join(w.write_floats([v[i] for v in values]) for i in range(len(values[0])))
+        if tag == 'Color3uint8':
+            return b''.join(bytes(round(v[i] * 255) for v in values) for i in range(3))
+        if tag == 'Font':
+            return b''.join(w.write_string(v['url']) + struct.pack('<HB', int(v['weight']), v['style'] == 'Italic')
+                            + w.write_string('') for v in values)
+        raise ValueError(f"No test encoding for {tag}")
+
+    flat = []
+
+    def walk(item, parent):
+        flat.append((item, parent))
+        ref = len(flat) - 1
+        for child in item.children:
+            walk(child, ref)
+
+    for item in items:
+        walk(item, -1)
+    by_class = {}
+    for ref, (item, _) in enumerate(flat):
+        by_class.setdefault(item.cls, []).append(ref)
+    ordered = sorted(by_class.items())
+    out = [w.MAGIC, struct.pack('<HII', 0, len(by_class), len(flat)), bytes(8)]
+    for class_id, (cls, refs) in enumerate(ordered):
+        out.append(w.chunk(b'INST', struct.pack('<I', class_id) + w.write_string(cls) + b'\0'
+                           + struct.pack('<I', len(refs)) + w.write_referents(refs)))
+    for class_id, (cls, refs) in enumerate(ordered):
+        # Every instance of a class carries the same properties in these fixtures
+        for name, tag in flat[refs[0]][0].props:
+            values = [flat[ref][0].props[(name, tag)] for ref in refs]
+            out.append(w.chunk(b'PROP', struct.pack('<I', class_id) + w.write_string(name)
+                               + bytes([type_ids[tag]]) + column(tag, values)))
+    out.append(w.chunk(b'PRNT', b'\0' + struct.pack('<I', len(flat)) + w.write_referents(range(len(flat)))
+                       + w.write_referents([parent for _, parent in flat])))
+    out.append(b'END\0' + struct.pack('<III', 0, 9, 0) + b'</roblox>')
+    return b''.join(out)
+
+
+def raw_chunk(name, payload_hex, compress=False):
+    """One chunk with a hand-written payload, stored raw or LZ4-compressed"""
+    payload = bytes.fromhex(payload_hex)
+    if not compress:
+        return name + struct.pack('<III', 0, len(payload), 0) + payload
+    import lz4.block
+    packed = lz4.block.compress(payload, store_size=False)
+    return name + struct.pack('<III', len(packed), len(payload), 0) + packed
+
+
+# A Frame "Box" holding two TextLabels, encoded by hand from the format description:
+# ints are zigzagged, floats have their sign bit rotated to the bottom, and both are
+# stored big-endian with the bytes of all values grouped plane by plane
+HAND_BUILT_RBXM = b''.join([
+    b'<roblox!\x89\xff\r\n\x1a\n', struct.pack('<HII', 0, 2, 3), bytes(8),
+    raw_chunk(b'INST', '00000000 05000000 4672616d65 00 01000000 00000000'),   # Frame: ref 0
+    raw_chunk(b'INST', '01000000 09000000 546578744c6162656c 00 02000000'        # TextLabel: refs 1, 2
+                       '0000 0000 0000 0202'),
+    raw_chunk(b'PROP', '00000000 04000000 4e616d65 01 03000000 426f78'),        # Name "Box"
+    raw_chunk(b'PROP', '00000000 04000000 53697a65 07'                          # Size UDim2
+                       '7e000000 00000000 00000014 00000027'),                 # {0.5, 10}, {0, -20}
+    raw_chunk(b'PROP', '00000000 16000000 4261636b67726f756e645472616e73706172656e6379 04'
+                       '7d000000'),                                              # BackgroundTransparency 0.25
+    raw_chunk(b'PROP', '00000000 07000000 56697369626c65 02 00'),               # Visible false
+    raw_chunk(b'PROP', '00000000 10000000 4261636b67726f756e64436f6c6f7233 1a'
+                       'ff 80 00'),                                              # BackgroundColor3 255, 128, 0
+    raw_chunk(b'PROP', '01000000 04000000 54657874 01 02000000 4869 02000000 596f'),  # Text "Hi", "Yo"
+    raw_chunk(b'PROP', '01000000 0e000000 5465787458416c69676e6d656e74 12'
+                       '0000 0000 0000 0002'),                                   # TextXAlignment 0, 2
+    raw_chunk(b'PROP', '01000000 08000000 506f736974696f6e 07'                  # Position UDim2
+                       '7d7e 0000 0000 0100'                                     # X scale -0.25, 0.5
+                       '7f00 0000 0000 0000'                                     # Y scale 1, 0
+                       '0000 0000 0000 0500'                                     # X offset -3, 0
+                       '0000 0000 0200 5802', compress=True),                   # Y offset 300, 1
+    raw_chunk(b'PRNT', '00 03000000 000000 000000 000000 000202'                 # refs 0, 1, 2
+                       '000000 000000 000000 010200', compress=True),           # parents -1, 0, 0
+    b'END\0' + struct.pack('<III', 0, 9, 0) + b'</roblox>',
+])
+
+
+class ParallelOutputTest(unittest.TestCase):
+    """Worker-pool generation must match the sequential path byte for byte"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = converter.create_pool(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.pool is not None:
+            cls.pool.terminate()
+
+    def setUp(self):
+        if self.pool is None:
+            self.skipTest("fork start method not available")
+        # Small units so even a test-sized file is split across many workers
+        patcher = mock.patch.multiple(UniversalConverter, PARALLEL_MIN_SIZE=0, UNIT_SIZE=40)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_sequential(self):
+        items = RBXMLParser.parse(make_rbxmx(1500, seed=1))
+        # One huge root forces the split-inside-an-element path as well
+        huge = [items[0]._replace(children=items, size=1 + sum(i.size for i in items))]
+        configs = [
+            {},
+            {'lazy': 'hidden', 'scale': 1.3, 'preload': 'background'},
+            {'lazy': 'all', 'draggable': True, 'destroykey': 'x', 'preload': 'blocking'},
+            {'format': 'rbxm'},
+        ]
+        for tree in (items, huge):
+            for config in configs:
+                with self.subTest(roots=len(tree), config=config):
+                    sequential = converter.convert_parsed(tree, config)
+                    parallel = converter.convert_parsed(tree, config, self.pool)
+                    self.assertEqual(parallel, sequential)
+
+
+class BinaryModelTest(unittest.TestCase):
+    """A .rbxm file must parse to the same Items as the equivalent .rbxmx"""
+
+    def test_same_items_as_rbxmx(self):
+        xml_items = RBXMLParser.parse(make_rbxmx(300, seed=2))
+        data = encode_rbxm(xml_items)
+        self.assertEqual(RBXMBinaryParser.parse(data), xml_items)
+        # parse() picks the binary reader from the magic bytes
+        self.assertEqual(converter.parse(data), xml_items)
+        self.assertEqual(converter.convert(data).output, converter.convert_parsed(xml_items).output)
+
+    def test_hand_built_model(self):
+        label_props = lambda text, align, pos: {
+            ('Text', 'string'): text, ('TextXAlignment', 'token'): align, ('Position', 'UDim2'): pos}
+        expected = [Item('Frame', {
+            ('Name', 'string'): 'Box',
+            ('Size', 'UDim2'): {'xs': 0.5, 'xo': 10.0, 'ys': 0.0, 'yo': -20.0},
+            ('BackgroundTransparency', 'float'): 0.25,
+            ('Visible', 'bool'): False,
+            ('BackgroundColor3', 'Color3uint8'): (1.0, 128 / 255, 0.0),
+        }, [
+            Item('TextLabel', label_props('Hi', 0, {'xs': -0.25, 'xo': -3.0, 'ys': 1.0, 'yo': 300.0}), [], 1),
+            Item('TextLabel', label_props('Yo', 2, {'xs': 0.5, 'xo': 0.0, 'ys': 0.0, 'yo': 1.0}), [], 1),
+        ], 3)]
+        self.assertEqual(RBXMBinaryParser.parse(HAND_BUILT_RBXM), expected)
+
+    def test_corrupt_chunk_sizes(self):
+        data = encode_rbxm(RBXMLParser.parse(make_rbxmx(50, seed=4)))
+        # The first chunk header starts at byte 32: name, compressed size, uncompressed size
+        for offset, value in [(40, 0x80000000), (40, 0xFFFFFFFF), (36, 0x7FFFFFFF), (36, 0)]:
+            corrupt = bytearray(data)
+            corrupt[offset:offset + 4] = struct.pack('<I', value)
+            with self.subTest(offset=offset, value=hex(value)):
+                with self.assertRaises(converter.BinaryModelError):
+                    RBXMBinaryParser.parse(bytes(corrupt))
+        for end in (20, 40, len(data) // 2):
+            with self.subTest(truncated=end), self.assertRaises(converter.BinaryModelError):
+                RBXMBinaryParser.parse(data[:end])
+
+
+class ModelExportTest(unittest.TestCase):
+    """format='rbxm' output must read back with RBXMBinaryParser"""
+
+    def test_export_round_trip(self):
+        data = make_rbxmx(300, seed=3)
+        config = {'draggable': True, 'destroykey': 'x', 'gui_name': 'Shop UI', 'preload': 'blocking'}
+        lua = converter.convert(data, config).output
+        roots = RBXMBinaryParser.parse(converter.convert(data, dict(config, format='rbxm')).output)
+
+        self.assertEqual(len(roots), 1)
+        gui = roots[0]
+        self.assertEqual((gui.cls, gui.props[('Name', 'string')]), ('ScreenGui', 'Shop UI'))
+
+        def walk(item):
+            yield item
+            for child in item.children:
+                yield from walk(child)
+
+        # Same instances, in creation order, as the Lua output builds, plus the loader script
+        exported = [item for item in walk(gui) if item.cls != 'LocalScript']
+        self.assertEqual([item.cls for item in exported], re.findall(r"Instance\.new\('(\w+)'\)", lua))
+        loader, = [item for item in gui.children if item.cls == 'LocalScript']
+        self.assertIn('InputBegan', loader.props[('Source', 'string')])
+
+    def test_export_keeps_text(self):
+        text = 'Say "hi"\\n \\ back'
+        data = make_rbxmx(20, seed=5).replace(b'>Label ', f'>{text} '.encode())
+        roots = RBXMBinaryParser.parse(converter.convert(data, {'format': 'rbxm', 'gui_name': "Bob's \\GUI"}).output)
+        self.assertEqual(roots[0].props[('Name', 'string')], "Bob's \\GUI")
+
+        def texts(item):
+            if ('Text', 'string') in item.props:
+                yield item.props[('Text', 'string')]
+            for child in item.children:
+                yield from texts(child)
+
+        exported = list(texts(roots[0]))
+        self.assertTrue(exported)
+        self.assertTrue(all(t.startswith(text + ' ') for t in exported), exported[:3])
+
+
+if __name__ == '__main__':
+    unittest.main()